@@ -1,29 +1,40 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, stream_template, request, jsonify, redirect, url_for
+import logging
 import os
-import sys
+import tempfile
+import threading
 from dotenv import load_dotenv
+from jinja2 import FileSystemBytecodeCache
 
 # Load environment variables
 load_dotenv()
 
-# Add src directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-from recommendation_engine import RecommendationEngine
-from recommendation_explainer import RecommendationExplainer
-from use_case_helper import UseCaseHelper
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+from pickllm.openrouter_client import start_connection_warmup
+from pickllm.recommendation_engine import RecommendationEngine
+from pickllm.recommendation_explainer import RecommendationExplainer
+from pickllm.use_case_helper import UseCaseHelper
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
+# Persist compiled template bytecode across restarts and workers
+_jinja_cache_dir = os.environ.get('JINJA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'pickllm-jinja'))
+os.makedirs(_jinja_cache_dir, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_jinja_cache_dir)
+
 # Initialize recommendation engine and explainer
 recommendation_engine = RecommendationEngine()
 recommendation_explainer = RecommendationExplainer()
 use_case_helper = UseCaseHelper()
 
-# Initialize RAG chatbot (lazy initialization on first request)
+# Initialize RAG chatbot (lazy initialization, guarded so concurrent first
+# requests don't each build the index)
 rag_chatbot = None
 chatbot_initialized = False
 chatbot_error = None
+_chatbot_lock = threading.Lock()
 
 def get_chatbot():
     """Get or initialize the RAG chatbot"""
@@ -32,49 +43,83 @@ def get_chatbot():
     if chatbot_initialized:
         return rag_chatbot
 
-    try:
-        print("🤖 Initializing RAG chatbot...")
-        from rag import RAGChatbot
-        rag_chatbot = RAGChatbot()
-        rag_chatbot.initialize()
+    with _chatbot_lock:
+        # Another thread may have finished initializing while we waited
+        if chatbot_initialized:
+            return rag_chatbot
+
+        try:
+            print("🤖 Initializing RAG chatbot...")
+            from pickllm.rag import RAGChatbot
+            chatbot = RAGChatbot()
+            chatbot.initialize()
+            rag_chatbot = chatbot
+            print("✅ RAG chatbot initialized successfully")
+        except Exception as e:
+            chatbot_error = str(e)
+            print(f"❌ Failed to initialize chatbot: {e}")
+        else:
+            # Reuse the chatbot's embedding model for local use case classification
+            try:
+                use_case_helper.set_embedding_model(rag_chatbot.embedding_model)
+            except Exception as e:
+                print(f"⚠️ Embedding classifier unavailable: {e}")
+        # Mark as initialized either way to avoid retrying
         chatbot_initialized = True
-        print("✅ RAG chatbot initialized successfully")
         return rag_chatbot
-    except Exception as e:
-        chatbot_error = str(e)
-        chatbot_initialized = True  # Mark as initialized to avoid retrying
-        print(f"❌ Failed to initialize chatbot: {e}")
-        return None
+
+def start_chatbot_warmup():
+    """Initialize the RAG chatbot in a background thread so it overlaps with the first requests."""
+    threading.Thread(target=get_chatbot, name='chatbot-warmup', daemon=True).start()
 
 # Custom Jinja filter for simple markdown rendering
+import functools
 import re
-@app.template_filter('simple_markdown')
+
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+# A run of consecutive bullet lines ("- " or "* " after any indentation),
+# captured so re.split keeps it
+_BULLET_BLOCK_RE = re.compile(r'(?m)((?:^[^\S\n]*[-*] .*\S.*(?:\n|$))+)')
+
+def _render_bullet_block(block):
+    """Render a run of bullet lines as a single <ul>."""
+    # Split on '\n' only, as the block regex does; splitlines() would also
+    # break on characters like \x0c or \u2028 inside an item
+    items = ''.join(f'<li>{ln.strip()[2:]}</li>' for ln in block.split('\n') if ln.strip())
+    return f'<ul class="mb-3">{items}</ul>'
+
+def _render_paragraphs(chunk):
+    """Wrap each non-empty line of a chunk in <p> tags."""
+    return ''.join(f'<p>{line}</p>' for line in chunk.split('\n') if line.strip())
+
+@functools.lru_cache(maxsize=512)
+def _render_simple_markdown(text):
+    """Render bold and bullets to HTML; cached since explanations repeat across users."""
+    # Convert **text** to <strong>text</strong>
+    text = _BOLD_RE.sub(r'<strong>\1</strong>', text)
+    # re.split with a capturing group alternates [paragraphs, bullets, paragraphs, ...]
+    parts = _BULLET_BLOCK_RE.split(text)
+    return ''.join(
+        _render_bullet_block(part) if i % 2 else _render_paragraphs(part)
+        for i, part in enumerate(parts)
+    )
+
 def simple_markdown(text):
     """Convert simple markdown to HTML (bold and bullets only)."""
     if not text:
         return text
-    # Convert **text** to <strong>text</strong>
-    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
-    # Convert bullet points (- or *) to HTML list items
-    lines = text.split('\n')
-    in_list = False
-    result = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('- ') or stripped.startswith('* '):
-            if not in_list:
-                result.append('<ul class="mb-3">')
-                in_list = True
-            result.append(f'<li>{stripped[2:]}</li>')
-        else:
-            if in_list:
-                result.append('</ul>')
-                in_list = False
-            if stripped:  # Only add non-empty lines
-                result.append(f'<p>{line}</p>')
-    if in_list:
-        result.append('</ul>')
-    return ''.join(result)
+    # Jinja may hand us Markup; coerce so the cache key is a plain str
+    return _render_simple_markdown(str(text))
+
+app.add_template_filter(simple_markdown, 'simple_markdown')
+
+# Compile the page templates at startup (after the filter they use is
+# registered) so the first request doesn't pay for it
+for _template in ('landing.html', 'questionnaire.html', 'results.html'):
+    app.jinja_env.get_template(_template)
+
+# Explanations longer than this are streamed instead of rendered in one go
+_STREAM_EXPLANATION_CHARS = 2000
 
 @app.route('/')
 def landing():
@@ -118,8 +163,10 @@ def submit_questionnaire():
         print(f"❌ Error generating explanation: {e}")
         explanation = ""
 
-    # Render results page with recommendations
-    return render_template('results.html',
+    # Render results page with recommendations; stream long pages so the
+    # first bytes reach the client while Jinja is still rendering
+    render = stream_template if explanation and len(explanation) > _STREAM_EXPLANATION_CHARS else render_template
+    return render('results.html',
                          recommendations=recommendations,
                          use_case=use_case,
                          visual_ai_type=visual_ai_type,
@@ -131,10 +178,14 @@ def results():
     """Display LLM recommendations (direct access fallback)"""
     return render_template('results.html', recommendations=[])
 
-@app.route('/api/health')
+# Health checks are polled constantly, so the payload is serialized once
+_HEALTH_BODY = b'{"status":"healthy","service":"PickLLM"}'
+_HEALTH_HEADERS = {'Content-Type': 'application/json', 'Content-Length': str(len(_HEALTH_BODY))}
+
+@app.route('/api/health', provide_automatic_options=False)
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "PickLLM"})
+    return Response(_HEALTH_BODY, headers=_HEALTH_HEADERS, direct_passthrough=True)
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -170,6 +221,20 @@ def chat():
             "status": "success"
         })
 
+# Map use case category to display label
+_CATEGORY_LABELS = {
+    'conversational_knowledge': 'Conversational & Knowledge Agents',
+    'productivity_information': 'Productivity & Information Handling',
+    'creative_content': 'Creative & Content Generation',
+    'technical_developer': 'Technical & Developer Tools',
+    'advanced_automation': 'Advanced Automation',
+    'visual_ai': 'Visual AI'
+}
+
+# Pre-serialized bodies for the common suggest-use-case failures
+_ERR_NO_DESCRIPTION = b'{"error":"Description is required"}'
+_ERR_CLASSIFICATION_FAILED = b'{"error":"Failed to classify use case. Please try again.","status":"error"}'
+
 @app.route('/api/suggest-use-case', methods=['POST'])
 def suggest_use_case():
     """Endpoint to suggest use case category based on user description"""
@@ -178,30 +243,17 @@ def suggest_use_case():
         description = data.get('description', '').strip()
 
         if not description:
-            return jsonify({"error": "Description is required"}), 400
+            return Response(_ERR_NO_DESCRIPTION, status=400, mimetype='application/json')
 
         # Get use case suggestion from AI
         suggested_category = use_case_helper.use_case_classification(description)
 
         if not suggested_category:
-            return jsonify({
-                "error": "Failed to classify use case. Please try again.",
-                "status": "error"
-            }), 500
-
-        # Map category to display label
-        category_labels = {
-            'conversational_knowledge': 'Conversational & Knowledge Agents',
-            'productivity_information': 'Productivity & Information Handling',
-            'creative_content': 'Creative & Content Generation',
-            'technical_developer': 'Technical & Developer Tools',
-            'advanced_automation': 'Advanced Automation',
-            'visual_ai': 'Visual AI'
-        }
+            return Response(_ERR_CLASSIFICATION_FAILED, status=500, mimetype='application/json')
 
         return jsonify({
             "category": suggested_category,
-            "label": category_labels.get(suggested_category, suggested_category),
+            "label": _CATEGORY_LABELS.get(suggested_category, suggested_category),
             "status": "success"
         })
 
@@ -262,4 +314,6 @@ def save_feedback():
         }), 500
 
 if __name__ == '__main__':
+    start_chatbot_warmup()
+    start_connection_warmup()
     app.run(debug=True, host='0.0.0.0', port=5555)
@@ -0,0 +1,14 @@
+# gunicorn picks this file up automatically from the working directory.
+
+
+def post_fork(server, worker):
+    """Warm up the RAG chatbot and the OpenRouter connection in each worker.
+
+    Done after fork rather than under --preload: the embedding model and its
+    threads don't survive fork() safely, and pooled sockets must not be
+    shared between workers, so each worker builds its own.
+    """
+    from app import start_chatbot_warmup
+    from pickllm.openrouter_client import start_connection_warmup
+    start_chatbot_warmup()
+    start_connection_warmup()
@@ -0,0 +1,10 @@
+# PickLLM recommendation, data pipeline and chatbot modules
+
+import os
+
+# Leaderboard CSVs. Defaults to data/ in the repository checkout; set
+# PICKLLM_DATA_DIR when the package is imported from anywhere else
+DATA_DIR = os.environ.get(
+    'PICKLLM_DATA_DIR',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'data')),
+)
@@ -0,0 +1,47 @@
+import functools
+import numpy as np
+import pandas as pd
+
+from pickllm.match_openrouter import fetch_openrouter_models
+
+PRICE_COLUMNS = ['pricing.prompt', 'pricing.completion', 'pricing.image']
+
+@functools.lru_cache(maxsize=1)
+def _openrouter_df() -> pd.DataFrame:
+    """OpenRouter id/description/pricing table, built once per process.
+
+    Call _openrouter_df.cache_clear() to pick up a fresh catalog.
+    """
+    openrouter_models = fetch_openrouter_models()
+    # Only flatten the fields we keep instead of normalizing the whole payload
+    openrouter_models_df = pd.DataFrame({
+        'id': [m['id'] for m in openrouter_models],
+        'description': [m.get('description') for m in openrouter_models],
+        **{col: [m.get('pricing', {}).get(col.split('.')[1]) for m in openrouter_models] for col in PRICE_COLUMNS},
+    })
+    openrouter_models_df[PRICE_COLUMNS] = openrouter_models_df[PRICE_COLUMNS].apply(pd.to_numeric, errors='coerce', downcast='float')
+    return openrouter_models_df
+
+def build_pricing(df: pd.DataFrame) -> pd.DataFrame:
+    """Merge OpenRouter pricing into a leaderboard and derive display/pricing columns in one pass."""
+    merged = df.merge(_openrouter_df(), left_on='openrouter_id', right_on='id', how='left')
+    # Insert derived columns right after the leaderboard's own columns, as before
+    n_cols = len(df.columns)
+    merged.insert(n_cols, 'displayed_name', merged['openrouter_id'].where(merged['openrouter_id'].notna(), merged['model']))
+    merged.insert(n_cols + 1, 'pricing_source', np.where(merged['license'].values == 'Proprietary', "openrouter", "free"))
+    # Missing components count as 0; rows with no pricing at all stay NaN
+    merged['pricing'] = merged[PRICE_COLUMNS].sum(axis=1, min_count=1)
+    return merged
+
+def sum_pricing(df: pd.DataFrame) -> pd.DataFrame:
+    """Recompute the total price on an already-merged pricing CSV."""
+    df_result = df.copy()
+    # Missing components count as 0; rows with no pricing at all stay NaN
+    df_result['pricing'] = df_result[PRICE_COLUMNS].sum(axis=1, min_count=1)
+    return df_result
+
+# if __name__ == "__main__":
+#     df_webdev = pd.read_csv("../data/lmarena_webdev_with_pricing_or.csv")
+#     df = sum_pricing(df_webdev)
+#     df.to_csv("../data/lmarena_webdev_with_pricing.csv", index=False)
+#     print("Sum price completed")
\ No newline at end of file
@@ -1,14 +1,18 @@
-import glob
 import os
+import numpy as np
 import pandas as pd
 import pickle
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
+
+from pickllm import DATA_DIR
 
 FILE_DIR = os.path.dirname(os.path.abspath(__file__))
-ROOT_DIR = os.path.abspath(os.path.join(FILE_DIR, os.pardir))
-CSV_DIR = os.path.join(ROOT_DIR, "data")
+ROOT_DIR = os.path.abspath(os.path.join(FILE_DIR, os.pardir, os.pardir))
+CSV_DIR = DATA_DIR
 LMARENA_DIR = os.path.join(ROOT_DIR, "lmarena")
 
 def clone_lmarena_repo():
@@ -18,9 +22,19 @@ def clone_lmarena_repo():
     if not os.path.exists(repo):
         try:
             print("Installing git-lfs...")
-            subprocess.run(["git", "lfs", "install", "--skip-repo"])
+            subprocess.run(["git", "lfs", "install", "--skip-repo"], check=True)
             print(f"Cloning repository from {url}...")
-            subprocess.run(["git", "clone", "--depth", "1", url, repo], check=True)
+            # Partial, sparse clone: only the result pickles and metadata CSVs are
+            # checked out, and LFS content is skipped until we know which to fetch
+            no_smudge = {**os.environ, "GIT_LFS_SKIP_SMUDGE": "1"}
+            subprocess.run(["git", "clone", "--depth", "1", "--filter=blob:none", "--no-checkout", url, repo], check=True, env=no_smudge)
+            subprocess.run(["git", "-C", repo, "sparse-checkout", "set", "--no-cone", "elo_results_*.pkl", "leaderboard_table_*.csv"], check=True)
+            subprocess.run(["git", "-C", repo, "checkout"], check=True, env=no_smudge)
+            # Pull real LFS content only for the newest results and metadata
+            latest_pkl, _ = _latest(repo, 'elo_results_', '.pkl')
+            latest_csv, _ = _latest(repo, 'leaderboard_table_', '.csv')
+            include = ",".join(os.path.basename(f) for f in (latest_pkl, latest_csv) if f)
+            subprocess.run(["git", "-C", repo, "lfs", "pull", "--include", include], check=True)
             print("Repository cloned successfully!")
         except subprocess.CalledProcessError as e:
             print(f"Error cloning repository: {e}")
@@ -32,11 +46,19 @@ def clone_lmarena_repo():
 def get_date_from_filename(filename):
     return filename.split('_')[-1].split('.')[0]
 
-def get_pkl_by_date(repo):
-    files = glob.glob(f"{repo}/*.pkl")
-    if not files:
-        raise FileNotFoundError("No .pkl files found in the lmarena directory.")
+def _latest(directory, prefix, suffix):
+    """Return (path, date) of the newest <prefix>*<suffix> file in one directory pass."""
+    best, best_date = None, ''
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith(prefix) and name.endswith(suffix):
+                date = get_date_from_filename(name)
+                if date > best_date:
+                    best, best_date = entry.path, date
+    return best, best_date
 
+def get_pkl_by_date(repo):
     # Always use today's date
     today = datetime.now().strftime("%Y%m%d")
 
@@ -47,9 +69,9 @@ def get_pkl_by_date(repo):
         return today_file
 
     # If not found, get the newest available file
-    files.sort(key=get_date_from_filename, reverse=True)
-    latest_file = files[0]
-    latest_date = get_date_from_filename(latest_file)
+    latest_file, latest_date = _latest(repo, 'elo_results_', '.pkl')
+    if latest_file is None:
+        raise FileNotFoundError("No .pkl files found in the lmarena directory.")
     print(f"File for {today} not found. Using latest available file: {latest_file} (date: {latest_date})", file=sys.stderr)
     return latest_file
 
@@ -59,10 +81,14 @@ def get_date_version(repo):
     date = get_date_from_filename(filename)
     return date, filename
 
-def load_lmarena_data(filename, subset):
+def load_lmarena_pickle(filename):
     with open(filename, 'rb') as f:
-        data = pickle.load(f)
+        return pickle.load(f)
+
+def load_lmarena_data(filename, subset):
+    return load_lmarena_data_from_dict(load_lmarena_pickle(filename), subset)
 
+def load_lmarena_data_from_dict(data, subset):
     if isinstance(data, dict):
         if subset in data:
             subset_data = data[subset]
@@ -78,15 +104,12 @@ def load_lmarena_data(filename, subset):
         return None
 
 def load_lmarena_metadata(repo):
-    # Find all metadata files and get the most recent one
-    metadata_files = glob.glob(f"{repo}/leaderboard_table_*.csv")
-    if metadata_files:
-        # Sort by date in filename to get the most recent
-        metadata_files.sort(key=lambda x: get_date_from_filename(x), reverse=True)
-        latest_file = metadata_files[0]
-        latest_date = get_date_from_filename(latest_file)
+    # Find the most recent metadata file
+    latest_file, latest_date = _latest(repo, 'leaderboard_table_', '.csv')
+    if latest_file:
         print(f"Using latest metadata file: {latest_file} (date: {latest_date})", file=sys.stderr)
-        df = pd.read_csv(latest_file)
+        # Arrow-backed dtypes keep the string columns compact for the merges below
+        df = pd.read_csv(latest_file, engine='pyarrow', dtype_backend='pyarrow')
     else:
         print(f"No metadata files found in {repo}", file=sys.stderr)
         return None
@@ -99,27 +122,26 @@ def load_lmarena_metadata(repo):
         print(f"Saved metadata to {out_path}")
     except Exception as e:
         print(f"Failed to save metadata to {out_path}: {e}", file=sys.stderr)
-    return df
+    # Index by model key once so every subset can join on it directly
+    return df.set_index('key')
 
 def build_full_leaderboard(leaderboard, metadata):
-    lm = leaderboard.merge(metadata, left_index=True, right_on='key')
+    lm = leaderboard.join(metadata, how='inner')
+    rating = lm['rating'].values
+    ci_upper = (lm['rating_upper'].values - rating).astype(np.int64).astype(str)
+    ci_lower = (rating - lm['rating_lower'].values).astype(np.int64).astype(str)
+    cutoff = lm['Knowledge cutoff date'].astype(str).values
     df = pd.DataFrame({
         'rank': range(1, len(lm) + 1),
         'rank_stylectrl': lm['final_ranking'].values.astype(int),
         'model': lm['Model'].values,
         'arena_score': lm['rating'].values.astype(int),
-        '95_pct_ci': [
-            f"+{int(upper - rating)}/-{int(rating - lower)}" 
-            for rating, upper, lower in zip(
-                lm['rating'].values,
-                lm['rating_upper'].values,
-                lm['rating_lower'].values
-            )
-        ],
+        '95_pct_ci': np.char.add(np.char.add(np.char.add('+', ci_upper), '/-'), ci_lower),
         'votes': lm['num_battles'].values.astype(int),
         'organization': lm['Organization'].values,
         'license': lm['License'].values,
-        'knowledge_cutoff': lm['Knowledge cutoff date'].astype(str).str.replace('-', 'not specified', regex=False).values,
+        # '-' is the metadata's placeholder for an unknown cutoff
+        'knowledge_cutoff': np.where(cutoff == '-', 'not specified', cutoff),
         'url': lm['Link'].values,
     })
     return df
@@ -129,15 +151,24 @@ def build_directory(dir):
         os.makedirs(dir)
     return dir
 
+def _build_one(subset, leaderboard, metadata, out_dir):
+    # Module-level so it can be pickled into ProcessPoolExecutor workers
+    print(f"Building {subset} Leaderboard")
+    df = build_full_leaderboard(leaderboard, metadata)
+    path = os.path.join(out_dir, f"lmarena_{subset}.csv")
+    df.to_csv(path, index=False)
+    return path
+
 def build_lmarena_leaderboards(metadata, filename):
     dir = build_directory(CSV_DIR)
     subsets = ['text', 'vision', 'image', 'image-edit', 'webdev']
-    for subset in subsets:
-        print(f"Building {subset} Leaderboard")
-        leaderboard = load_lmarena_data(filename, subset)
-        df = build_full_leaderboard(leaderboard, metadata)
-        path = os.path.join(dir, f"lmarena_{subset}.csv")
-        df.to_csv(path, index=False)
+    # Unpickle once and hand each worker only its own subset's frame
+    data = load_lmarena_pickle(filename)
+    leaderboards = [load_lmarena_data_from_dict(data, subset) for subset in subsets]
+    del data
+    # Subsets are independent, so build them in parallel
+    with ProcessPoolExecutor(max_workers=min(len(subsets), os.cpu_count() or 1)) as ex:
+        list(ex.map(_build_one, subsets, leaderboards, repeat(metadata), repeat(dir)))
 
 if __name__ == "__main__":
     repo = clone_lmarena_repo()
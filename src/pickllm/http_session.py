@@ -0,0 +1,17 @@
+"""Shared requests session for outbound HTTP (OpenRouter catalog, GitHub archives)."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds for every call made through SESSION
+DEFAULT_TIMEOUT = (5, 60)
+
+# One pooled session so repeated fetches reuse TCP/TLS connections, with
+# retries on transient failures
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+))
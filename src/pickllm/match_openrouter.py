@@ -0,0 +1,269 @@
+"""
+Add pricing data to lmarena_*.csv:
+- For Proprietary models: Match with OpenRouter and get real pricing
+- For Open-source models: Set pricing to $0
+"""
+
+import functools
+import os
+import csv
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from joblib import Parallel, delayed
+from rapidfuzz import fuzz, process
+
+from pickllm import DATA_DIR
+from pickllm.http_session import DEFAULT_TIMEOUT, SESSION
+
+
+@functools.lru_cache(maxsize=1)
+def fetch_openrouter_models() -> List[Dict]:
+    """Fetch all models from OpenRouter API (cached for the life of the process)."""
+    url = "https://openrouter.ai/api/v1/models"
+    response = SESSION.get(url, timeout=DEFAULT_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    return data['data']
+
+
+@functools.lru_cache(maxsize=8192)
+def normalize_model_name(name: str) -> str:
+    """Normalize model name for matching."""
+    normalized = name.lower()
+    # Remove organization prefix if present
+    if '/' in normalized:
+        normalized = normalized.split('/')[-1]
+    # Remove :free suffix
+    normalized = normalized.replace(':free', '')
+    # Remove common separators for better matching
+    normalized = normalized.replace('-', '').replace('_', '').replace(' ', '')
+    return normalized
+
+
+class OpenRouterCache(NamedTuple):
+    """OpenRouter models with their ids/names normalized once, index-aligned."""
+    models: List[Dict]
+    ids: List[str]
+    names: List[str]
+    # normalized org -> boolean mask of ids containing it
+    org_hits: Dict[str, np.ndarray]
+
+
+def build_openrouter_cache(openrouter_models: List[Dict], organizations: List[str] = ()) -> OpenRouterCache:
+    """Normalize every OpenRouter id/name once, and precompute org masks for the given organizations."""
+    ids = [normalize_model_name(m['id']) for m in openrouter_models]
+    org_hits = {}
+    for org in organizations:
+        normalized_org = normalize_model_name(org)
+        if normalized_org not in org_hits:
+            org_hits[normalized_org] = _org_mask(normalized_org, ids)
+    return OpenRouterCache(
+        models=list(openrouter_models),
+        ids=ids,
+        names=[normalize_model_name(m['name']) for m in openrouter_models],
+        org_hits=org_hits,
+    )
+
+
+def _org_mask(normalized_org: str, normalized_ids: List[str]) -> np.ndarray:
+    return np.array([normalized_org in or_id for or_id in normalized_ids], dtype=bool)
+
+
+def _name_scores(normalized_name: str, ids: List[str], names: List[str], cutoff: float) -> np.ndarray:
+    """Best fuzz.ratio of the name against each id/name pair, scaled to 0.0-1.0."""
+    score_name_id = process.cdist([normalized_name], ids, scorer=fuzz.ratio, score_cutoff=cutoff)[0]
+    score_name_name = process.cdist([normalized_name], names, scorer=fuzz.ratio, score_cutoff=cutoff)[0]
+    return np.maximum(score_name_id, score_name_name) / 100.0
+
+
+def find_best_match(
+    normalized_name: str,
+    normalized_org: str,
+    or_cache: OpenRouterCache
+) -> Tuple[Optional[Dict], float]:
+    """
+    Find the best matching OpenRouter model.
+
+    Args:
+        normalized_name: Normalized model name from lmarena CSV (e.g., 'gpt4olatest')
+        normalized_org: Normalized organization name (e.g., 'openai')
+        or_cache: Output of build_openrouter_cache() for all OpenRouter models
+
+    Returns:
+        Tuple of (best matching model dict or None, similarity score)
+    """
+    # Scores below this can't reach the 0.6 match threshold even with the org boost
+    cutoff = 50.0
+
+    org_in_id = or_cache.org_hits.get(normalized_org)
+    if org_in_id is None:
+        org_in_id = _org_mask(normalized_org, or_cache.ids)
+
+    # Try same-organization models first; a near-perfect hit there can't be
+    # meaningfully beaten, so skip scoring the rest of the catalog
+    org_idx = np.flatnonzero(org_in_id)
+    if len(org_idx):
+        org_scores = _name_scores(
+            normalized_name,
+            [or_cache.ids[i] for i in org_idx],
+            [or_cache.names[i] for i in org_idx],
+            cutoff,
+        )
+        org_scores = np.minimum(1.0, org_scores * 1.2)  # 20% boost for org match
+        best = int(np.argmax(org_scores))
+        if org_scores[best] >= 0.99:
+            return (or_cache.models[org_idx[best]], float(org_scores[best]))
+
+    # Calculate similarity scores against every OpenRouter id and name at once
+    scores = _name_scores(normalized_name, or_cache.ids, or_cache.names, cutoff)
+
+    # Boost score if organization matches
+    scores = np.where(org_in_id, np.minimum(1.0, scores * 1.2), scores)  # 20% boost for org match
+
+    if not len(scores):
+        return (None, 0.0)
+    # argmax returns the first maximum, keeping the earliest model on ties
+    best = int(np.argmax(scores))
+    if scores[best] <= 0.0:
+        return (None, 0.0)
+    return (or_cache.models[best], float(scores[best]))
+
+
+def _match_row(row: Dict, or_cache: OpenRouterCache) -> Dict:
+    """Return a copy of an lmarena CSV row with openrouter_id and match_score filled in."""
+    result = row.copy()
+
+    # Check if proprietary
+    is_proprietary = row['license'].lower() == 'proprietary'
+
+    if is_proprietary:
+        # Match with OpenRouter
+        or_model, score = find_best_match(
+            normalize_model_name(row['model']),
+            normalize_model_name(row['organization']),
+            or_cache
+        )
+
+        if or_model and score >= 0.6:
+            # The /models payload already carries pricing, so record it now
+            pricing = or_model.get('pricing') or {}
+            result['openrouter_id'] = or_model['id']
+            result['match_score'] = f"{score:.2f}"
+            result['prompt_price'] = pricing.get('prompt', '')
+            result['completion_price'] = pricing.get('completion', '')
+        else:
+            result['openrouter_id'] = ''
+            result['match_score'] = '0.00'
+            result['prompt_price'] = ''
+            result['completion_price'] = ''
+    else:
+        # Open-source: Leave empty
+        result['openrouter_id'] = ''
+        result['match_score'] = ''
+        result['prompt_price'] = ''
+        result['completion_price'] = ''
+
+    return result
+
+
+def add_openrouter_ids(
+    input_csv_path: str,
+    output_csv_path: str,
+    openrouter_models: Optional[List[Dict]] = None
+):
+    """
+    Add OpenRouter ID and match score columns to lmarena CSV files.
+
+    Output columns added:
+    - openrouter_id (suggested match for proprietary, empty for open-source)
+    - match_score (confidence of the match, 0.0-1.0)
+    - prompt_price, completion_price (OpenRouter per-token pricing of the match)
+
+    Pass openrouter_models to reuse an already fetched catalog.
+    """
+    print(f"\n📄 Processing: {os.path.basename(input_csv_path)}")
+
+    if openrouter_models is None:
+        print("Fetching OpenRouter models...")
+        openrouter_models = fetch_openrouter_models()
+        print(f"✓ Fetched {len(openrouter_models)} models from OpenRouter")
+
+    # Read input CSV
+    with open(input_csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames) + ['openrouter_id', 'match_score', 'prompt_price', 'completion_price']
+        rows = list(reader)
+    print(f"✓ Found {len(rows)} models in file")
+
+    or_cache = build_openrouter_cache(openrouter_models, [row['organization'] for row in rows])
+
+    # Process each model; rows are independent, so match them across processes
+    results = Parallel(n_jobs=-1, prefer='processes', batch_size=32)(
+        delayed(_match_row)(row, or_cache) for row in rows
+    )
+    matched_count = sum(1 for r in results if r['openrouter_id'])
+
+    # Write output CSV
+    with open(output_csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows([[r.get(k, '') for k in fieldnames] for r in results])
+
+    print(f"✓ Matched {matched_count} proprietary models")
+    print(f"✓ Output saved to: {os.path.basename(output_csv_path)}\n")
+
+
+def _process_file(input_path: str, output_path: str, openrouter_models: List[Dict]):
+    """Run add_openrouter_ids for one file, reporting errors instead of raising."""
+    try:
+        add_openrouter_ids(input_path, output_path, openrouter_models)
+    except Exception as e:
+        print(f"❌ Error processing {os.path.basename(input_path)}: {e}")
+        import traceback
+        traceback.print_exc()
+        print("\nContinuing with next file...\n")
+
+
+if __name__ == '__main__':
+    import glob
+
+    data_dir = DATA_DIR
+
+    pattern = os.path.join(data_dir, 'lmarena_*.csv')
+    all_files = glob.glob(pattern)
+
+    # Filter out files that already have openrouter_ids or pricing
+    input_files = [
+        f for f in all_files
+        if not ('_with_openrouter_ids' in f or '_with_pricing' in f or '_openrouter' in f)
+    ]
+
+    if not input_files:
+        print("❌ No lmarena CSV files found to process!")
+        exit(1)
+
+    print("="*100)
+    print("OpenRouter ID Matcher - Batch Processing")
+    print("="*100)
+    print(f"\nFound {len(input_files)} files to process:")
+    for f in input_files:
+        print(f"  - {os.path.basename(f)}")
+
+    # Fetch once and share with every worker instead of one API call per file
+    print("Fetching OpenRouter models...")
+    openrouter_models = fetch_openrouter_models()
+    print(f"✓ Fetched {len(openrouter_models)} models from OpenRouter")
+
+    def output_path_for(input_path):
+        name_without_ext = os.path.splitext(os.path.basename(input_path))[0]
+        return os.path.join(data_dir, f"{name_without_ext}_with_openrouter_ids.csv")
+
+    # Files are independent and matching is CPU-bound, so process them in parallel
+    Parallel(n_jobs=min(len(input_files), os.cpu_count() or 1), backend='loky')(
+        delayed(_process_file)(p, output_path_for(p), openrouter_models)
+        for p in input_files
+    )
+
+    print("="*100)
+    print("✅ All files processed!")
+    print("="*100)
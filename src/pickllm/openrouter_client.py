@@ -0,0 +1,118 @@
+"""Shared OpenRouter client so every caller reuses one pooled HTTP connection."""
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Attribution headers OpenRouter asks apps to send with every completion
+EXTRA_HEADERS = {
+    "HTTP-Referer": "https://pickllm.com",
+    "X-Title": "PickLLM",
+}
+
+# Most async completions in flight at once per event loop; bursts beyond the
+# API tier's limit would only come back as 429s and retries
+LLM_MAX_CONCURRENT = int(os.environ.get('LLM_MAX_CONCURRENT', '8'))
+
+# Per-request timeout, so one hung call can't stall a page render
+TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+
+# Retries on connection errors, timeouts, 408/409/429 and 5xx, with the SDK's
+# exponential backoff and jitter (honouring Retry-After)
+MAX_RETRIES = 3
+
+# HTTP/2 lets concurrent async completions share one TLS connection as
+# multiplexed streams instead of each opening its own
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60.0)
+
+
+@functools.lru_cache(maxsize=1)
+def _http_client() -> httpx.Client:
+    """The pooled HTTP client behind get_client()."""
+    return httpx.Client(http2=True, limits=_LIMITS, timeout=TIMEOUT)
+
+
+def start_connection_warmup() -> None:
+    """Open a pooled connection to OpenRouter in the background so the first real call skips DNS/TLS setup.
+
+    Call this per process after any fork, so workers don't share a socket.
+    """
+    def warm():
+        try:
+            _http_client().head(f"{OPENROUTER_BASE_URL}/models", timeout=5.0)
+        except httpx.HTTPError:
+            # Nothing to do: the first real call will connect on its own
+            pass
+
+    threading.Thread(target=warm, name='openrouter-warmup', daemon=True).start()
+
+
+def get_client() -> OpenAI:
+    """Return the process-wide OpenRouter client, keeping connections alive between calls.
+
+    Raises ValueError if OPENROUTER_API_KEY is not set.
+    """
+    return _client(_api_key())
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Async counterpart of get_client, shared by everything on the running event loop.
+
+    Must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = _async_client(_api_key())
+    return client
+
+
+async def acreate_completion(**kwargs):
+    """Await a chat completion on the loop's async client, at most LLM_MAX_CONCURRENT at a time."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENT)
+    async with semaphore:
+        return await get_async_client().chat.completions.create(**kwargs)
+
+
+def _api_key() -> str:
+    api_key = os.environ.get('OPENROUTER_API_KEY')
+    if not api_key:
+        raise ValueError("OPENROUTER_API_KEY environment variable not set")
+    return api_key
+
+
+@functools.lru_cache(maxsize=1)
+def _client(api_key: str) -> OpenAI:
+    return OpenAI(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key,
+        timeout=TIMEOUT,
+        max_retries=MAX_RETRIES,
+        http_client=_http_client(),
+    )
+
+
+# An httpx.AsyncClient's connections belong to the loop that opened them, so
+# each event loop (e.g. each asyncio.run()) gets its own async client
+_async_clients = weakref.WeakKeyDictionary()
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _async_client(api_key: str) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        base_url=OPENROUTER_BASE_URL,
+        api_key=api_key,
+        timeout=TIMEOUT,
+        max_retries=MAX_RETRIES,
+        http_client=httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=TIMEOUT),
+    )
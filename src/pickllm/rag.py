@@ -1,23 +1,35 @@
-import io
+import functools
+import hashlib
+import logging
+import tempfile
 import zipfile
-import requests
 import frontmatter
 import re
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
 from minsearch import VectorSearch
 from sentence_transformers import SentenceTransformer
 from minsearch import Index
-from tqdm.auto import tqdm
 import numpy as np
 
+from pickllm.http_session import DEFAULT_TIMEOUT, SESSION
+from pickllm.openrouter_client import EXTRA_HEADERS, get_client
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Set cache directories for HuggingFace Spaces compatibility
 os.environ['TRANSFORMERS_CACHE'] = os.environ.get('TRANSFORMERS_CACHE', '/tmp/.cache/huggingface')
 os.environ['HF_HOME'] = os.environ.get('HF_HOME', '/tmp/.cache/huggingface')
 os.environ['SENTENCE_TRANSFORMERS_HOME'] = os.environ.get('SENTENCE_TRANSFORMERS_HOME', '/tmp/.cache/sentence-transformers')
+RAG_CACHE_DIR = os.environ.get('RAG_CACHE_DIR', '/tmp/.cache/pickllm-rag')
+
+@functools.lru_cache(maxsize=None)
+def _header_pattern(level):
+    """Compiled regex for markdown headers of the given level, built once per level."""
+    # For level 2, it matches lines starting with "## "
+    return re.compile(r'^(#{' + str(level) + r'} )(.+)$', re.MULTILINE)
 
 class RAGChatbot:
     def __init__(self):
@@ -25,19 +37,15 @@ class RAGChatbot:
         self.chunks = None
         self.embeddings = None
         self.repo_vindex = None
-        api_key = os.environ.get('OPENROUTER_API_KEY')
-        if not api_key:
-            raise ValueError("OPENROUTER_API_KEY environment variable not set")
-
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-        )
+        self.repo_key = None
+        self.repo_hash = None
+        self.client = get_client()
         self.model = "z-ai/glm-4.5-air:free"
 
     def initialize(self, repo_owner='Rachel0619', repo_name='PickLLM'):
         """Initialize the chatbot by loading and processing repository data"""
         print(f"Initializing RAG chatbot with {repo_owner}/{repo_name}...")
+        self.repo_key = f"{repo_owner}_{repo_name}"
         data = self._read_repo_data(repo_owner, repo_name)
         self.chunks = self._process_documents(data)
         self._build_index()
@@ -47,16 +55,28 @@ class RAGChatbot:
         """Read repository data from GitHub"""
         prefix = 'https://codeload.github.com'
         url = f'{prefix}/{repo_owner}/{repo_name}/zip/refs/heads/main'
-        resp = requests.get(url)
-
-        if resp.status_code != 200:
-            raise Exception(f"Failed to download repository: {resp.status_code}")
+        # Stream the archive to a spooled file (memory first, disk past 64 MB)
+        # instead of holding the whole download in memory twice
+        archive = tempfile.SpooledTemporaryFile(max_size=64 << 20)
+        hasher = hashlib.sha256()
+        with SESSION.get(url, stream=True, timeout=DEFAULT_TIMEOUT) as resp:
+            if resp.status_code != 200:
+                raise Exception(f"Failed to download repository: {resp.status_code}")
+            for block in resp.iter_content(chunk_size=1 << 16):
+                hasher.update(block)
+                archive.write(block)
+        archive.seek(0)
+
+        # Keys the on-disk embeddings cache; changes whenever the repo does
+        self.repo_hash = hasher.hexdigest()
 
         repository_data = []
 
-        zf = zipfile.ZipFile(io.BytesIO(resp.content))
+        zf = zipfile.ZipFile(archive)
 
         for file_info in zf.infolist():
+            if file_info.is_dir():
+                continue
             filename = file_info.filename
             filename_lower = filename.lower()
 
@@ -75,6 +95,7 @@ class RAGChatbot:
                 print(f'Error processing {filename}: {e}')
                 continue
         zf.close()
+        archive.close()
         return repository_data
 
     def _split_markdown_by_level(self, text, level=2):
@@ -85,10 +106,7 @@ class RAGChatbot:
         :param level: Header level to split on
         :return: List of sections as strings
         """
-        # This regex matches markdown headers
-        # For level 2, it matches lines starting with "## "
-        header_pattern = r'^(#{' + str(level) + r'} )(.+)$'
-        pattern = re.compile(header_pattern, re.MULTILINE)
+        pattern = _header_pattern(level)
 
         # Split and keep the headers
         parts = pattern.split(text)
@@ -134,20 +152,67 @@ class RAGChatbot:
         """Build vector search index from chunks"""
         print("Building vector index...")
         self.embedding_model = SentenceTransformer('multi-qa-distilbert-cos-v1')
-        embeddings = []
-        for d in tqdm(self.chunks):
-            v = self.embedding_model.encode(d['section'])
-            embeddings.append(v)
-        self.embeddings = np.array(embeddings)
+        # Repeated questions skip the forward pass; bound to this model instance
+        self._encode_query = functools.lru_cache(maxsize=1024)(self.embedding_model.encode)
+        self.embeddings = self._load_cached_embeddings()
+        if self.embeddings is None:
+            # One batched call instead of a forward pass per chunk
+            texts = [d['section'] for d in self.chunks]
+            self.embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=True
+            )
+            self._save_cached_embeddings()
         self.repo_vindex = VectorSearch()
         self.repo_vindex.fit(self.embeddings, self.chunks)
         print("✅ Vector index built successfully")
 
+    def _embeddings_cache_path(self):
+        """Path of the embeddings cache for the current repo snapshot, or None."""
+        if not self.repo_key or not self.repo_hash:
+            return None
+        return os.path.join(RAG_CACHE_DIR, f"{self.repo_key}_{self.repo_hash}.npz")
+
+    def _load_cached_embeddings(self):
+        """Load embeddings cached for this exact repo snapshot, if any.
+
+        Chunks are derived deterministically from the same zip, so only the
+        embeddings need caching.
+        """
+        path = self._embeddings_cache_path()
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            # Stored as float16; search runs in float32 where numpy uses BLAS
+            embeddings = np.load(path)['embeddings'].astype(np.float32)
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable embeddings cache {path}: {e}")
+            return None
+        if len(embeddings) != len(self.chunks):
+            return None
+        print(f"✅ Loaded cached embeddings from {path}")
+        return embeddings
+
+    def _save_cached_embeddings(self):
+        """Persist embeddings for warm starts; failures only cost a cache miss."""
+        path = self._embeddings_cache_path()
+        if not path:
+            return
+        try:
+            os.makedirs(RAG_CACHE_DIR, exist_ok=True)
+            # float16 halves the cache size; unit-norm embeddings lose nothing that matters for ranking
+            np.savez(path, embeddings=self.embeddings.astype(np.float16))
+        except Exception as e:
+            print(f"⚠️  Failed to cache embeddings to {path}: {e}")
+
     def _vector_search(self, query, num_results=2):
         """Search for relevant context using vector similarity"""
         if self.repo_vindex is None or self.embedding_model is None:
             raise Exception("Chatbot not initialized. Call initialize() first.")
-        q = self.embedding_model.encode(query)
+        q = self._encode_query(query)
         return self.repo_vindex.search(q, num_results=num_results)
 
     def _format_prompt(self, query, context):
@@ -181,10 +246,7 @@ Instructions:
             # Format prompt and call LLM
             prompt = self._format_prompt(query, context)
             completion = self.client.chat.completions.create(
-                extra_headers={
-                    "HTTP-Referer": "https://pickllm.com",
-                    "X-Title": "PickLLM",
-                },
+                extra_headers=EXTRA_HEADERS,
                 model=self.model,
                 messages=[
                     {
@@ -203,11 +265,8 @@ Instructions:
             answer = completion.choices[0].message.content
             return answer
 
-        except Exception as e:
-            import traceback
-            error_trace = traceback.format_exc()
-            print(f"❌ Error in chat: {e}")
-            print(f"❌ Full traceback:\n{error_trace}")
+        except Exception:
+            logger.exception("Chat completion failed")
             return "I'm sorry, I encountered an error processing your question. Please try again."
 
 
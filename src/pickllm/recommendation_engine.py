@@ -2,10 +2,23 @@ import os
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 
+from pickllm import DATA_DIR
+
+# Leaderboard columns used for recommendations; the rest (e.g. the long
+# OpenRouter descriptions) are skipped when parsing
+LEADERBOARD_COLUMNS = frozenset({
+    'rank', 'model', 'displayed_name', 'arena_score', 'votes', 'organization',
+    'license', 'url', '95_pct_ci', 'knowledge_cutoff', 'pricing',
+})
+
 class RecommendationEngine:
     def __init__(self):
         """Initialize the recommendation engine with data directory path."""
-        self.data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
+        self.data_dir = DATA_DIR
+
+        # Parsed CSVs keyed by filename, as (mtime, DataFrame, views from
+        # _build_views); reloaded when the file changes
+        self._df_cache: Dict[str, Tuple[float, pd.DataFrame, Dict[str, Dict[str, pd.DataFrame]]]] = {}
 
         # Organization to logo filename mapping
         self.org_to_logo = {
@@ -29,6 +42,7 @@ class RecommendationEngine:
             'Inflection': 'inflection.png',
             'Stability AI': 'stability.png',
         }
+        self.org_to_logo_url = {org: f'/static/images/logos/{filename}' for org, filename in self.org_to_logo.items()}
 
         # Mapping from questionnaire choices to CSV files (with pricing data)
         self.use_case_mapping = {
@@ -69,6 +83,9 @@ class RecommendationEngine:
         """
         Load leaderboard data from specified CSV files.
 
+        DataFrames are cached across calls and shared, so callers must not
+        modify them in place.
+
         Args:
             csv_files: List of CSV filenames to load
 
@@ -82,7 +99,16 @@ class RecommendationEngine:
 
             if os.path.exists(file_path):
                 try:
-                    df = pd.read_csv(file_path)
+                    mtime = os.path.getmtime(file_path)
+                    cached = self._df_cache.get(csv_file)
+                    if cached is not None and cached[0] == mtime:
+                        data[csv_file] = cached[1]
+                        continue
+                    # Callable usecols tolerates CSVs that lack some of the columns
+                    df = pd.read_csv(file_path, usecols=lambda c: c in LEADERBOARD_COLUMNS)
+                    # Parse pricing once here instead of on every lower_cost request
+                    df['pricing_numeric'] = pd.to_numeric(df['pricing'], errors='coerce')
+                    self._df_cache[csv_file] = (mtime, df, self._build_views(df))
                     data[csv_file] = df
                     print(f"✅ Loaded {csv_file}: {len(df)} models")
                 except Exception as e:
@@ -92,6 +118,25 @@ class RecommendationEngine:
 
         return data
 
+    def _build_views(self, df: pd.DataFrame) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Pre-sort and pre-filter a leaderboard so requests only pick a view.
+
+        Returns:
+            Nested dict: sort column ('rank' or 'pricing_numeric') ->
+            license filter ('all', 'open', 'proprietary') -> DataFrame
+        """
+        views = {}
+        for sort_column in ('rank', 'pricing_numeric'):
+            ordered = df.sort_values(sort_column, ascending=True, kind='stable')
+            is_proprietary = (ordered['license'] == 'Proprietary').values
+            views[sort_column] = {
+                'all': ordered,
+                'open': ordered[~is_proprietary],
+                'proprietary': ordered[is_proprietary],
+            }
+        return views
+
     def get_top_recommendations(self, use_case: str, visual_ai_type: Optional[str] = None, model_type: Optional[str] = None, priority: Optional[str] = None, top_n: int = 3) -> List[Dict]:
         """
         Get top N model recommendations for a given use case.
@@ -128,44 +173,44 @@ class RecommendationEngine:
             print(f"❌ No data in primary CSV: {primary_csv}")
             return []
 
-        # Apply model type filter based on user preference
+        # Pick the view already sorted for the user's priority
+        views = self._df_cache[primary_csv][2]
+        if priority == 'lower_cost':
+            # Sort by pricing (ascending) - lower cost first
+            views = views['pricing_numeric']
+            print(f"💰 Sorted by cost (lowest first)")
+        else:
+            # Default: Sort by rank (better performance first)
+            views = views['rank']
+            print(f"🏆 Sorted by performance (rank)")
+
+        # ...and already filtered for the user's model type preference
         if model_type == 'open_only':
-            # Filter to exclude proprietary models
-            df = df[df['license'] != 'Proprietary']
+            # Exclude proprietary models
+            df = views['open']
             print(f"🔓 Filtered to open weights models: {len(df)} models")
         elif model_type == 'proprietary_only_enterprise':
-            # Filter to include only proprietary models
-            df = df[df['license'] == 'Proprietary']
+            # Include only proprietary models
+            df = views['proprietary']
             print(f"🔒 Filtered to proprietary models: {len(df)} models")
-        # If 'no_preference', no filtering is applied
+        else:
+            # If 'no_preference', no filtering is applied
+            df = views['all']
 
         if df.empty:
             print(f"❌ No models found after applying model_type filter: {model_type}")
             return []
 
-        # Apply sorting based on user's priority
-        if priority == 'lower_cost':
-            # Sort by pricing (ascending) - lower cost first
-            # Convert pricing to float, handling non-numeric values
-            df['pricing_numeric'] = pd.to_numeric(df['pricing'], errors='coerce')
-            df = df.sort_values('pricing_numeric', ascending=True)
-            print(f"💰 Sorted by cost (lowest first)")
-        else:
-            # Default: Sort by rank (better performance first)
-            # CSV is already sorted by rank, but ensure it
-            df = df.sort_values('rank', ascending=True)
-            print(f"🏆 Sorted by performance (rank)")
-
         # Get top N models
         top_models = df.head(top_n)
 
-        # Convert to list of dictionaries with relevant fields
+        # Convert to list of dictionaries with relevant fields; plain dict
+        # records avoid building a Series per row
         recommendations = []
-        for idx, row in top_models.iterrows():
+        for idx, row in enumerate(top_models.to_dict(orient='records')):
             organization = row.get('organization', 'Unknown')
-            # Get logo filename from mapping
-            logo_filename = self.org_to_logo.get(organization, '')
-            logo_url = f'/static/images/logos/{logo_filename}' if logo_filename else ''
+            # Get logo URL from mapping
+            logo_url = self.org_to_logo_url.get(organization, '')
 
             model_info = {
                 'rank': int(row.get('rank', idx + 1)),
@@ -0,0 +1,332 @@
+import functools
+import logging
+from typing import Dict, Iterator, List, Optional
+
+from pickllm.openrouter_client import EXTRA_HEADERS, acreate_completion, get_client
+from pickllm.response_cache import ResponseCache, make_key
+
+logger = logging.getLogger(__name__)
+
+_SYSTEM_PROMPT = "You are an AI assistant helping users understand LLM recommendations. Provide clear, concise explanations in 2-3 paragraphs."
+
+# Display labels for the known form values; anything else is title-cased on the fly
+_USE_CASE_LABEL = {
+    'conversational_knowledge': 'Conversational Knowledge',
+    'productivity_information': 'Productivity Information',
+    'creative_content': 'Creative Content',
+    'technical_developer': 'Technical Developer',
+    'advanced_automation': 'Advanced Automation',
+    'visual_ai': 'Visual Ai',
+}
+
+_VISUAL_AI_LABEL = {
+    'image_understanding': 'Image Understanding',
+    'image_generation': 'Image Generation',
+    'image_editing': 'Image Editing',
+}
+
+_MODEL_PREF_MAP = {
+    'open_only': 'Open-source models only',
+    'proprietary_only_enterprise': 'Proprietary/Enterprise models only',
+    'no_preference': 'No preference on model type'
+}
+
+# Fixed parts of the explanation prompt; only the use case, the optional
+# preference lines and the recommendation list vary per call
+_PROMPT_HEADER = """A user is looking for LLM recommendations based on the following requirements:
+
+**Use Case**: """
+
+_PROMPT_MID = """
+Based on their requirements, we recommended these top 3 models from the LMSYS Chatbot Arena leaderboard:
+
+"""
+
+_PROMPT_FOOTER = """
+
+Please write a 3-paragraph explanation following this structure:
+
+**Paragraph 1**: Summarize the user's needs in natural language. For example: "You are looking for an open-weight model for conversational use cases, with low cost and medium latency." Make it conversational and personalized based on their use case and model preference.
+
+**Paragraph 2**: Briefly introduce the three recommended models by name and organization. DO NOT mention their Arena scores or vote counts (this info is already shown in the result cards).
+
+**Paragraph 3**: For each of the 3 models, write 2-3 sentences describing what makes it unique and its key advantages for the user's use case. Format this as a bulleted list where each bullet starts with the model name in bold (e.g., "**Gemini-2.5-Pro**: ..."). Focus on practical benefits, capabilities, and differentiators.
+
+Keep it concise, informative, and user-friendly. Avoid repeating data already visible in the cards."""
+
+
+def _label(labels: Dict[str, str], value: str) -> str:
+    """Look up a form value's display label, title-casing unknown values."""
+    label = labels.get(value)
+    return label if label is not None else value.replace('_', ' ').title()
+
+
+def _recs_key(recommendations: List[Dict]) -> tuple:
+    """The recommendation fields the prompt uses, as a hashable tuple."""
+    return tuple(
+        (rec['model'], rec['organization'], rec['arena_score'], rec['votes'],
+         rec['license'], rec.get('knowledge_cutoff', 'N/A'))
+        for rec in recommendations
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _format_recs(recs: tuple) -> str:
+    """Format the recommendation list for the prompt (repeat top-3 lists are common)."""
+    return "\n".join(
+        f"{i}. {model} by {organization}\n"
+        f"   - Arena Score: {arena_score}\n"
+        f"   - Votes: {votes}\n"
+        f"   - License: {license}\n"
+        f"   - Knowledge Cutoff: {knowledge_cutoff}"
+        for i, (model, organization, arena_score, votes, license, knowledge_cutoff) in enumerate(recs, 1)
+    )
+
+
+class RecommendationExplainer:
+    """Generate natural language explanations for LLM recommendations using AI."""
+
+    # The same use case / preference / top-3 combinations recur constantly,
+    # so explanations are shared across instances
+    _cache = ResponseCache(maxsize=256)
+
+    model = "z-ai/glm-4.5-air:free"
+
+    def __init__(self):
+        """Initialize the explainer with OpenRouter API client."""
+        self.client = get_client()
+
+    @classmethod
+    def offline(cls) -> "RecommendationExplainer":
+        """An explainer without an API client, for building prompts and fallback explanations."""
+        explainer = cls.__new__(cls)
+        explainer.client = None
+        return explainer
+
+    def _build_prompt(
+        self,
+        use_case: str,
+        recommendations: List[Dict],
+        visual_ai_type: Optional[str] = None,
+        model_type: Optional[str] = None
+    ) -> str:
+        """Build the prompt for the LLM to generate explanation."""
+        extras = []
+        if visual_ai_type:
+            extras.append(f"**Visual AI Type**: {_label(_VISUAL_AI_LABEL, visual_ai_type)}\n")
+        if model_type:
+            extras.append(f"**Model Preference**: {_MODEL_PREF_MAP.get(model_type, 'No preference')}\n")
+
+        recommendations_text = _format_recs(_recs_key(recommendations))
+
+        prompt = "".join([
+            _PROMPT_HEADER,
+            _label(_USE_CASE_LABEL, use_case),
+            "\n",
+            *extras,
+            _PROMPT_MID,
+            recommendations_text,
+            _PROMPT_FOOTER,
+        ])
+
+        return prompt
+
+    def generate_explanation(
+        self,
+        use_case: str,
+        recommendations: List[Dict],
+        visual_ai_type: Optional[str] = None,
+        model_type: Optional[str] = None
+    ) -> str:
+        """
+        Generate a natural language explanation for why these models were recommended.
+
+        Args:
+            use_case: User's primary use case
+            recommendations: List of top 3 recommended models with their details
+            visual_ai_type: Visual AI type if applicable
+            model_type: Model type preference (open/proprietary/no preference)
+
+        Returns:
+            Natural language explanation (2-3 paragraphs)
+        """
+        key = self._cache_key(use_case, recommendations, visual_ai_type, model_type)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Build the prompt
+        prompt = self._build_prompt(use_case, recommendations, visual_ai_type, model_type)
+
+        try:
+            completion = self.client.chat.completions.create(**self._completion_kwargs(prompt))
+
+            explanation = completion.choices[0].message.content
+            if explanation:
+                self._cache.set(key, explanation)
+            return explanation
+
+        except Exception:
+            logger.exception("Explanation generation failed")
+            # Fallback to static explanation
+            return self._get_fallback_explanation(use_case, recommendations)
+
+    async def agenerate_explanation(
+        self,
+        use_case: str,
+        recommendations: List[Dict],
+        visual_ai_type: Optional[str] = None,
+        model_type: Optional[str] = None
+    ) -> str:
+        """Async version of generate_explanation, so it can be awaited alongside other calls."""
+        key = self._cache_key(use_case, recommendations, visual_ai_type, model_type)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        prompt = self._build_prompt(use_case, recommendations, visual_ai_type, model_type)
+
+        try:
+            completion = await acreate_completion(**self._completion_kwargs(prompt))
+
+            explanation = completion.choices[0].message.content
+            if explanation:
+                self._cache.set(key, explanation)
+            return explanation
+
+        except Exception:
+            logger.exception("Explanation generation failed")
+            # Fallback to static explanation
+            return self._get_fallback_explanation(use_case, recommendations)
+
+    def stream_explanation(
+        self,
+        use_case: str,
+        recommendations: List[Dict],
+        visual_ai_type: Optional[str] = None,
+        model_type: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Stream the explanation as it is generated, for callers that render incrementally.
+
+        Yields text fragments; a cached explanation or the static fallback is
+        yielded in one piece.
+        """
+        key = self._cache_key(use_case, recommendations, visual_ai_type, model_type)
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        prompt = self._build_prompt(use_case, recommendations, visual_ai_type, model_type)
+
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(**self._completion_kwargs(prompt), stream=True)
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    parts.append(text)
+                    yield text
+
+        except Exception:
+            logger.exception("Explanation streaming failed")
+            # Only fall back if nothing was sent yet; a partial answer stays as is
+            if not parts:
+                yield self._get_fallback_explanation(use_case, recommendations)
+            return
+
+        if parts:
+            self._cache.set(key, "".join(parts))
+
+    @staticmethod
+    def _cache_key(
+        use_case: str,
+        recommendations: List[Dict],
+        visual_ai_type: Optional[str],
+        model_type: Optional[str]
+    ) -> str:
+        """Key an explanation by everything the prompt depends on."""
+        return make_key({
+            "uc": use_case,
+            "vt": visual_ai_type,
+            "mt": model_type,
+            "recs": _recs_key(recommendations),
+        })
+
+    def _completion_kwargs(self, prompt: str) -> Dict:
+        """Request arguments shared by the sync and async explanation calls."""
+        return dict(
+            extra_headers=EXTRA_HEADERS,
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": _SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.7,
+            max_tokens=1000
+        )
+
+    def _get_fallback_explanation(self, use_case: str, recommendations: List[Dict]) -> str:
+        """Provide a static fallback explanation if API fails."""
+        use_case_formatted = _label(_USE_CASE_LABEL, use_case)
+
+        return f"""Based on your requirement for {use_case_formatted}, we've selected the top-performing models from the LMSYS Chatbot Arena leaderboard. These models have been rigorously tested through thousands of community evaluations, ensuring they meet high standards for real-world performance.
+
+The recommended models represent the best options currently available, ranked by their Arena Score which reflects head-to-head comparisons in blind tests. Each model has received substantial community validation through voting, providing confidence in their capabilities for your specific use case.
+
+These rankings are continuously updated based on the latest leaderboard data, ensuring you get recommendations based on current performance metrics and community feedback."""
+
+
+if __name__ == "__main__":
+    # Test the explainer
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    explainer = RecommendationExplainer()
+
+    # Test with sample data
+    test_recommendations = [
+        {
+            'model': 'GPT-4',
+            'organization': 'OpenAI',
+            'arena_score': 1250,
+            'votes': 50000,
+            'license': 'Proprietary',
+            'knowledge_cutoff': '2023/09'
+        },
+        {
+            'model': 'Claude-3-Opus',
+            'organization': 'Anthropic',
+            'arena_score': 1240,
+            'votes': 45000,
+            'license': 'Proprietary',
+            'knowledge_cutoff': '2023/08'
+        },
+        {
+            'model': 'Gemini-Pro',
+            'organization': 'Google',
+            'arena_score': 1230,
+            'votes': 40000,
+            'license': 'Proprietary',
+            'knowledge_cutoff': '2023/11'
+        }
+    ]
+
+    explanation = explainer.generate_explanation(
+        use_case='conversational_knowledge',
+        recommendations=test_recommendations,
+        model_type='no_preference'
+    )
+
+    print("Generated Explanation:")
+    print("=" * 80)
+    print(explanation)
@@ -0,0 +1,366 @@
+import asyncio
+import difflib
+import functools
+import logging
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from pickllm.openrouter_client import EXTRA_HEADERS, acreate_completion, get_client
+from pickllm.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+_CATEGORY_DESCRIPTIONS = {
+    'conversational_knowledge': 'Chatbots, Q&A, virtual assistants, customer support, knowledge retrieval',
+    'productivity_information': 'Document processing, summarization, email drafting, data organization',
+    'creative_content': 'Writing, marketing copy, social media content, story generation',
+    'technical_developer': 'Code generation, debugging, technical docs, programming help',
+    'advanced_automation': 'Multi-step workflows, agent orchestration, API integration',
+    'visual_ai': 'Image understanding/generation/editing, visual content creation',
+}
+
+_VALID_CATEGORIES = frozenset(_CATEGORY_DESCRIPTIONS)
+
+# Static parts of the classification prompts, built once
+_CATEGORIES_TEXT = "Categories:\n" + "\n".join(
+    f"- {category}: {description}" for category, description in _CATEGORY_DESCRIPTIONS.items()
+)
+
+_CLASSIFY_HEAD = "Classify this use case into exactly one category."
+
+_CLASSIFY_TAIL = f"""
+
+{_CATEGORIES_TEXT}
+
+Return ONLY the category name, nothing else."""
+
+_BATCH_CLASSIFY_PREFIX = f"""Classify each numbered description into exactly one category.
+
+{_CATEGORIES_TEXT}
+
+Return one line per description in the form "<number>. <category name>", nothing else."""
+
+# Unambiguous keyword signals per category (matched as word prefixes)
+_CATEGORY_KEYWORD_RES = {
+    category: re.compile(r'\b(?:' + '|'.join(keywords) + r')', re.IGNORECASE)
+    for category, keywords in {
+        'conversational_knowledge': [r'chat ?bot', r'assistant', r'customer (?:support|service)', r'q&a', r'faq',
+                                     r'questions', r'virtual agent', r'knowledge base', r'conversational'],
+        'productivity_information': [r'summari[sz]', r'summary', r'e-?mails?\b', r'documents?\b',
+                                     r'meeting notes', r'spreadsheet', r'note-?taking'],
+        'creative_content': [r'blog', r'marketing', r'copywrit', r'stor(?:y|ies)', r'fiction', r'poe(?:m|try)',
+                             r'social media', r'slogan'],
+        'technical_developer': [r'code\b', r'coding', r'debug', r'programming', r'unit tests?', r'sql\b',
+                                r'database', r'refactor'],
+        'advanced_automation': [r'workflow', r'multi-?step', r'orchestrat', r'integrat', r'pipeline',
+                                r'chains? together'],
+        'visual_ai': [r'images?\b', r'photos?\b', r'pictures?\b', r'visual', r'video', r'diagram'],
+    }.items()
+}
+
+# Embedding classification only answers when it is this sure
+_EMBEDDING_MIN_SCORE = 0.75
+_EMBEDDING_MIN_MARGIN = 0.1
+
+# The longest category name is a handful of tokens; a tight cap stops
+# models from rambling on after the answer
+_CLASSIFICATION_MAX_TOKENS = 16
+
+# Special tokens some models leak into their output
+_SPECIAL_TOKEN_RE = re.compile(r'<\|(?:begin_of_sentence|end_of_text|im_end|im_start)\|>|<｜begin▁of▁sentence｜>')
+
+# "3. creative_content", "3) creative_content", "3: creative_content", ...
+_BATCH_LINE_RE = re.compile(r'^\s*(\d+)\s*[.):-]\s*(.+?)\s*$', re.MULTILINE)
+
+class UseCaseHelper:
+
+    # Classifications keyed by normalized description, shared across instances
+    _cache = ResponseCache(maxsize=1024)
+
+    # Using DeepSeek R1 Distill which is reliable, free, and good at instruction following
+    model = "deepseek/deepseek-chat-v3.1:free"
+
+    def __init__(self, use_local: bool = True):
+        """
+        Initialize the helper with OpenRouter API client.
+
+        Args:
+            use_local: Answer clear-cut descriptions from keywords or embeddings
+                without an LLM call; pass False to always ask the LLM
+        """
+        self.client = get_client()
+        self.use_local = use_local
+
+        # Optional sentence-transformers model for local classification,
+        # set with set_embedding_model(); (encode, category embeddings)
+        self._embedder = None
+
+    @classmethod
+    def offline(cls, use_local: bool = True) -> "UseCaseHelper":
+        """A helper without an API client, for building prompts and local classification."""
+        helper = cls.__new__(cls)
+        helper.client = None
+        helper.use_local = use_local
+        helper._embedder = None
+        return helper
+
+    def _build_prompt(
+        self,
+        user_description: str
+    ) -> str:
+        """Build the prompt for classifying user's use case description."""
+        return f'{_CLASSIFY_HEAD}\n\nDescription: "{user_description}"{_CLASSIFY_TAIL}'
+
+    def use_case_classification(
+        self,
+        use_case_description: str
+    ) -> str:
+        """
+        Classify user's input into one of the 6 use cases.
+
+        Args:
+            use_case_description: User's primary use case written in descriptive natural language
+
+        Returns:
+            classification (one of: conversational_knowledge, productivity_information,
+            creative_content, technical_developer, advanced_automation, visual_ai)
+        """
+        key = self._cache_key(use_case_description)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        local = self._local_classification(use_case_description)
+        if local:
+            return local
+
+        try:
+            completion = self.client.chat.completions.create(**self._completion_kwargs(use_case_description))
+            classification = self._clean_classification(completion.choices[0].message.content)
+            if classification:
+                self._cache.set(key, classification)
+            return classification
+
+        except Exception:
+            logger.exception("Use case classification failed")
+            return None
+
+    async def ause_case_classification(
+        self,
+        use_case_description: str
+    ) -> str:
+        """Async version of use_case_classification, so it can be awaited alongside other calls."""
+        key = self._cache_key(use_case_description)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        local = self._local_classification(use_case_description)
+        if local:
+            return local
+
+        try:
+            completion = await acreate_completion(**self._completion_kwargs(use_case_description))
+            classification = self._clean_classification(completion.choices[0].message.content)
+            if classification:
+                self._cache.set(key, classification)
+            return classification
+
+        except Exception:
+            logger.exception("Use case classification failed")
+            return None
+
+    def use_case_classification_batch(
+        self,
+        use_case_descriptions: List[str]
+    ) -> List[Optional[str]]:
+        """
+        Classify many descriptions with a single request.
+
+        Cached descriptions are not resent. Any description the batched
+        answer doesn't cover is classified on its own.
+
+        Returns:
+            Classifications aligned with use_case_descriptions
+        """
+        results, pending = self._batch_lookup(use_case_descriptions)
+        if not pending:
+            return results
+
+        try:
+            completion = self.client.chat.completions.create(
+                **self._batch_completion_kwargs([use_case_descriptions[i] for i in pending])
+            )
+            parsed = self._parse_batch(completion.choices[0].message.content, len(pending))
+        except Exception:
+            logger.exception("Batch use case classification failed")
+            parsed = [None] * len(pending)
+
+        for i, classification in zip(pending, parsed):
+            if classification:
+                self._cache.set(self._cache_key(use_case_descriptions[i]), classification)
+                results[i] = classification
+            else:
+                results[i] = self.use_case_classification(use_case_descriptions[i])
+        return results
+
+    async def ause_case_classification_batch(
+        self,
+        use_case_descriptions: List[str]
+    ) -> List[Optional[str]]:
+        """Async version of use_case_classification_batch; per-item fallbacks run concurrently."""
+        results, pending = self._batch_lookup(use_case_descriptions)
+        if not pending:
+            return results
+
+        try:
+            completion = await acreate_completion(
+                **self._batch_completion_kwargs([use_case_descriptions[i] for i in pending])
+            )
+            parsed = self._parse_batch(completion.choices[0].message.content, len(pending))
+        except Exception:
+            logger.exception("Batch use case classification failed")
+            parsed = [None] * len(pending)
+
+        missing = []
+        for i, classification in zip(pending, parsed):
+            if classification:
+                self._cache.set(self._cache_key(use_case_descriptions[i]), classification)
+                results[i] = classification
+            else:
+                missing.append(i)
+        fallbacks = await asyncio.gather(
+            *(self.ause_case_classification(use_case_descriptions[i]) for i in missing)
+        )
+        for i, classification in zip(missing, fallbacks):
+            results[i] = classification
+        return results
+
+    def _batch_lookup(self, use_case_descriptions: List[str]):
+        """Fill results from the cache or local classifier; return them with the indices still to classify."""
+        results = [
+            self._cache.get(self._cache_key(d)) or self._local_classification(d)
+            for d in use_case_descriptions
+        ]
+        pending = [i for i, r in enumerate(results) if r is None]
+        return results, pending
+
+    def _batch_completion_kwargs(self, use_case_descriptions: List[str]) -> Dict:
+        """One request classifying every description, numbered from 1."""
+        numbered = "\n".join(f'{i}. "{d}"' for i, d in enumerate(use_case_descriptions, 1))
+        return dict(
+            extra_headers=EXTRA_HEADERS,
+            model=self.model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"{_BATCH_CLASSIFY_PREFIX}\n\nDescriptions:\n{numbered}"
+                }
+            ],
+            temperature=0,
+            max_tokens=_CLASSIFICATION_MAX_TOKENS * len(use_case_descriptions)
+        )
+
+    @classmethod
+    def _parse_batch(cls, output: Optional[str], count: int) -> List[Optional[str]]:
+        """Map "<number>. <category>" lines back to positions; unanswered ones stay None."""
+        parsed = [None] * count
+        for number, classification in _BATCH_LINE_RE.findall(output or ''):
+            index = int(number) - 1
+            if 0 <= index < count:
+                parsed[index] = cls._clean_classification(classification) or None
+        return parsed
+
+    def set_embedding_model(self, embedding_model) -> None:
+        """Enable embedding-based local classification with a loaded SentenceTransformer."""
+        category_embeddings = embedding_model.encode(
+            list(_CATEGORY_DESCRIPTIONS.values()), normalize_embeddings=True
+        )
+        encode = functools.lru_cache(maxsize=1024)(
+            lambda text: embedding_model.encode(text, normalize_embeddings=True)
+        )
+        self._embedder = (encode, category_embeddings)
+
+    def _local_classification(self, use_case_description: str) -> Optional[str]:
+        """
+        Classify without an LLM call when the answer is clear-cut.
+
+        Keywords decide when exactly one category matches at least two of
+        them; otherwise the embedding model (if set) decides when its best
+        category is both similar enough and well ahead of the runner-up.
+        Returns None when neither is confident, or when use_local is off.
+        """
+        if not self.use_local:
+            return None
+        hits = {
+            category: len(set(m.lower() for m in keyword_re.findall(use_case_description)))
+            for category, keyword_re in _CATEGORY_KEYWORD_RES.items()
+        }
+        matched = [category for category, count in hits.items() if count]
+        if len(matched) == 1 and hits[matched[0]] >= 2:
+            return matched[0]
+
+        if self._embedder is None or not use_case_description.strip():
+            return None
+        encode, category_embeddings = self._embedder
+        scores = category_embeddings @ encode(use_case_description)
+        runner_up, best = np.argsort(scores)[-2:]
+        if scores[best] > _EMBEDDING_MIN_SCORE and scores[best] - scores[runner_up] > _EMBEDDING_MIN_MARGIN:
+            return list(_CATEGORY_DESCRIPTIONS)[best]
+        return None
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Forget all cached classifications (shared by every instance)."""
+        cls._cache.clear()
+
+    @staticmethod
+    def _cache_key(use_case_description: str) -> str:
+        """Lowercase and collapse whitespace so trivially different inputs share a classification."""
+        return ' '.join(use_case_description.lower().split())
+
+    def _completion_kwargs(self, use_case_description: str) -> Dict:
+        """Request arguments shared by the sync and async classification calls."""
+        return dict(
+            extra_headers=EXTRA_HEADERS,
+            model=self.model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": self._build_prompt(use_case_description)
+                }
+            ],
+            temperature=0,
+            max_tokens=_CLASSIFICATION_MAX_TOKENS
+        )
+
+    @staticmethod
+    def _clean_classification(classification: Optional[str]) -> Optional[str]:
+        """
+        Clean up the response and map it onto a known category.
+
+        Returns None if the response isn't close to any category.
+        """
+        if not classification:
+            return classification
+        classification = _SPECIAL_TOKEN_RE.sub('', classification).strip().lower()
+        if classification in _VALID_CATEGORIES:
+            return classification
+        close = difflib.get_close_matches(classification, _VALID_CATEGORIES, n=1)
+        return close[0] if close else None
+
+if __name__ == "__main__":
+    # Test the classifier
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    classifier = UseCaseHelper()
+
+    # Test with a sample description
+    test_description = "I need to analyze product images from our e-commerce site, generate detailed descriptions of items, and categorize them automatically based on visual features like color, style, and composition."
+
+    print(f"Testing with description: {test_description}\n")
+    response = classifier.use_case_classification(test_description)
+    print(f"Classification result: {response}")
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""Shared fixtures for the LLM test suite."""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+from dotenv import load_dotenv
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+def pytest_configure(config):
+    # RUN_LLM_TESTS=1 brings the real-API tests back into the default run
+    if os.environ.get("RUN_LLM_TESTS") == "1" and config.option.markexpr == "not integration":
+        config.option.markexpr = ""
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-llm-cache",
+        action="store_true",
+        default=False,
+        help="Call the LLM for deterministic requests instead of replaying cached responses (and refresh the cache)",
+    )
+
+
+_CONTEXT_RE = re.compile(r'Relevant context from PickLLM documentation:\n(.*?)\n\nInstructions:', re.DOTALL)
+
+
+class StubCompletions:
+    """Stands in for client.chat.completions, answering from the context in the prompt."""
+
+    def create(self, messages, **kwargs):
+        prompt = messages[-1]['content']
+        match = _CONTEXT_RE.search(prompt)
+        context = ' '.join(match.group(1).split()) if match else ''
+        answer = f"Based on the PickLLM documentation: {context[:400]}".rstrip('.') + '.'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+
+class StubOpenRouterClient:
+    """Minimal OpenAI client double exposing chat.completions.create."""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=StubCompletions())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _load_env():
+    """Load .env once per session (once per xdist worker)."""
+    load_dotenv()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _llm_response_cache(request):
+    """
+    Replay deterministic (temperature=0) chat completions from pytest's cache directory.
+
+    The first run records each response under .pytest_cache/d/llm, keyed by
+    the model, messages and max_tokens. Later runs skip the API call.
+    Sampled and streaming requests always go to the API.
+
+    Yields the unpatched create methods, for fixtures that must bypass it.
+    """
+    from openai.resources.chat.completions import AsyncCompletions, Completions
+    from openai.types.chat import ChatCompletion
+
+    cache_dir = request.config.cache.mkdir("llm")
+    refresh = request.config.getoption("--no-llm-cache")
+
+    def cache_path(kwargs):
+        if kwargs.get("temperature") != 0 or kwargs.get("stream"):
+            return None
+        key = hashlib.sha256(json.dumps({
+            "model": kwargs.get("model"),
+            "messages": kwargs.get("messages"),
+            "max_tokens": kwargs.get("max_tokens"),
+            "temp": 0,
+        }, sort_keys=True).encode()).hexdigest()
+        return cache_dir / f"{key}.json"
+
+    def load(path):
+        if path is None or refresh or not path.exists():
+            return None
+        return ChatCompletion.model_validate_json(path.read_text())
+
+    def save(path, completion):
+        if path is not None and isinstance(completion, ChatCompletion):
+            path.write_text(completion.model_dump_json())
+
+    create, acreate = Completions.create, AsyncCompletions.create
+
+    def cached_create(self, *args, **kwargs):
+        path = cache_path(kwargs)
+        completion = load(path)
+        if completion is None:
+            completion = create(self, *args, **kwargs)
+            save(path, completion)
+        return completion
+
+    async def cached_acreate(self, *args, **kwargs):
+        path = cache_path(kwargs)
+        completion = load(path)
+        if completion is None:
+            completion = await acreate(self, *args, **kwargs)
+            save(path, completion)
+        return completion
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Completions, "create", cached_create)
+        mp.setattr(AsyncCompletions, "create", cached_acreate)
+        yield SimpleNamespace(create=create, acreate=acreate)
+
+
+def _completion_json(content):
+    """A minimal chat.completion body as OpenRouter returns it."""
+    return {
+        "id": "gen-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+    }
+
+
+@pytest.fixture
+def openrouter_mock(_llm_response_cache, monkeypatch):
+    """
+    Answer OpenRouter chat completions with canned replies, without the network.
+
+    Set the reply with openrouter_mock.reply(text), or one reply per call
+    with openrouter_mock.reply(first, second, ...); requests are recorded on
+    openrouter_mock.route.calls. Canned replies bypass the LLM response
+    cache, and the shared classification/explanation caches are cleared
+    around the test so they neither see nor keep real results.
+    """
+    import httpx
+    import respx
+    from openai.resources.chat.completions import AsyncCompletions, Completions
+
+    from pickllm.openrouter_client import OPENROUTER_BASE_URL
+    from pickllm.recommendation_explainer import RecommendationExplainer
+    from pickllm.use_case_helper import UseCaseHelper
+
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    monkeypatch.setattr(Completions, "create", _llm_response_cache.create)
+    monkeypatch.setattr(AsyncCompletions, "create", _llm_response_cache.acreate)
+
+    def clear_caches():
+        UseCaseHelper.cache_clear()
+        RecommendationExplainer._cache.clear()
+
+    clear_caches()
+    with respx.mock(assert_all_called=False) as router:
+        route = router.post(f"{OPENROUTER_BASE_URL}/chat/completions")
+
+        def reply(*contents):
+            if len(contents) == 1:
+                route.side_effect = None
+                route.respond(200, json=_completion_json(contents[0]))
+            else:
+                route.side_effect = [httpx.Response(200, json=_completion_json(c)) for c in contents]
+
+        reply("")
+        yield SimpleNamespace(route=route, reply=reply)
+    clear_caches()
+
+
+def _load_recs(name):
+    """Read a recommendation list from tests/data, frozen so session-shared copies can't be mutated by a test."""
+    return tuple(MappingProxyType(rec) for rec in json.loads((DATA_DIR / name).read_text()))
+
+
+@pytest.fixture(scope="session")
+def sample_recs():
+    """Proprietary recommendations (tests/data/sample_recs.json), loaded once per session."""
+    return _load_recs('sample_recs.json')
+
+
+@pytest.fixture(scope="session")
+def open_source_recs():
+    """Open-source recommendations (tests/data/open_source_recs.json), loaded once per session."""
+    return _load_recs('open_source_recs.json')
+
+
+@pytest.fixture(scope="session")
+def explainer():
+    """One RecommendationExplainer (and its pooled client) for the whole test run."""
+    from pickllm.recommendation_explainer import RecommendationExplainer
+
+    return RecommendationExplainer()
+
+
+@pytest.fixture(scope="session")
+def helper():
+    """
+    One UseCaseHelper (and its pooled client) for the whole test run.
+
+    Local keyword/embedding classification is off, so every classification
+    in the integration tests comes from the LLM.
+    """
+    from pickllm.use_case_helper import UseCaseHelper
+
+    return UseCaseHelper(use_local=False)
+
+
+@pytest.fixture(scope="session")
+def offline_explainer():
+    """A RecommendationExplainer with no API client, for prompt and fallback tests."""
+    from pickllm.recommendation_explainer import RecommendationExplainer
+
+    return RecommendationExplainer.offline()
+
+
+@pytest.fixture(scope="session")
+def offline_helper():
+    """A UseCaseHelper with no API client, for prompt tests."""
+    from pickllm.use_case_helper import UseCaseHelper
+
+    return UseCaseHelper.offline()
+
+
+@pytest.fixture
+def stub_rag_client(monkeypatch):
+    """Make RAGChatbot() get StubOpenRouterClient instead of the real client, so no API key is needed."""
+    from pickllm import rag
+
+    monkeypatch.setattr(rag, 'get_client', StubOpenRouterClient)
+
+
+@pytest.fixture(scope="session")
+def chatbot():
+    """
+    Create and initialize one RAG chatbot for the whole test run (downloads the repo and builds the index).
+
+    It is built with StubOpenRouterClient, so no API key is needed;
+    llm_chatbot swaps in the real client for integration tests.
+    """
+    from pickllm import rag
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(rag, 'get_client', StubOpenRouterClient)
+        bot = rag.RAGChatbot()
+    # Initialize with the PickLLM repository
+    bot.initialize(repo_owner='Rachel0619', repo_name='PickLLM')
+    return bot
+
+
+@pytest.fixture
+def llm_chatbot(chatbot, request, monkeypatch):
+    """
+    The shared chatbot for tests that call chat().
+
+    Answers come from StubOpenRouterClient, unless the test is marked
+    integration, in which case the real OpenRouter API is used.
+    """
+    if request.node.get_closest_marker('integration') is not None:
+        from pickllm.openrouter_client import get_client
+
+        monkeypatch.setattr(chatbot, 'client', get_client())
+    return chatbot
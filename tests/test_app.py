@@ -0,0 +1,50 @@
+"""
+Tests for the Flask app's simple_markdown template filter.
+
+The filter renders LLM explanations on the results page, so any text the
+model returns must render rather than raise.
+"""
+
+import os
+import pytest
+
+
+@pytest.fixture(scope="module")
+def simple_markdown():
+    """The filter from app.py (importing app builds its clients, which need an API key set)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENROUTER_API_KEY", os.environ.get("OPENROUTER_API_KEY") or "test-key")
+        from app import simple_markdown
+    return simple_markdown
+
+
+@pytest.mark.unit
+class TestSimpleMarkdown:
+    """Test bullet, paragraph and bold rendering."""
+
+    def test_bullets_and_paragraphs(self, simple_markdown):
+        """Test that a run of bullets becomes one list between paragraphs."""
+        html = simple_markdown("Intro\n- **GPT-4** leads\n* Claude follows\nOutro")
+
+        assert html == ('<p>Intro</p><ul class="mb-3"><li><strong>GPT-4</strong> leads</li>'
+                        '<li>Claude follows</li></ul><p>Outro</p>')
+
+    @pytest.mark.parametrize("text", ["- x\u2028y", "- a\x0cb", "- a\x85b", "* a\x1cb\n- c"])
+    def test_line_separators_inside_a_bullet(self, simple_markdown, text):
+        """Test that separators other than \\n stay inside the bullet instead of raising."""
+        html = simple_markdown(text)
+
+        items = text.split('\n')
+        assert html == '<ul class="mb-3">' + ''.join(f'<li>{item[2:]}</li>' for item in items) + '</ul>'
+
+    @pytest.mark.parametrize("text", ["-\tx", "-x", "*x", "- "])
+    def test_marker_needs_a_following_space(self, simple_markdown, text):
+        """Test that only '- ' and '* ' start a bullet."""
+        html = simple_markdown(text)
+
+        assert '<li>' not in html, f"{text!r} should not render as a bullet, got {html!r}"
+
+
+if __name__ == "__main__":
+    # Run tests with pytest
+    pytest.main([__file__, '-v'])
@@ -7,17 +7,13 @@ These tests verify that the LLM-powered use case classifier:
 3. Produces consistent results for similar inputs
 """
 
-import os
-import sys
+import asyncio
+import json
+import re
+import numpy as np
 import pytest
-from dotenv import load_dotenv
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-load_dotenv()
-
-from use_case_helper import UseCaseHelper
+from pickllm.use_case_helper import UseCaseHelper
 
 
 # Valid categories that the classifier should return
@@ -30,15 +26,40 @@ VALID_CATEGORIES = [
     'visual_ai'
 ]
 
+# Special tokens or formatting that must never leak into a classification
+UNWANTED_TOKEN_RE = re.compile(r"<\||\|>|</|EOF|```|\n\n")
+
+# Descriptions checked in bulk; classified up front in one batched request
+TECHNICAL_DESCRIPTIONS = [
+    "I need help debugging Python code and generating unit tests",
+    "Looking for a tool to help with code reviews and refactoring",
+    "Want an AI to help me write SQL queries and optimize database performance"
+]
+
+VISUAL_DESCRIPTIONS = [
+    "I want to generate product images for my e-commerce site",
+    "Need to analyze images and extract text from photos",
+    "Looking to edit and enhance photos automatically"
+]
+
+AUTOMATION_DESCRIPTIONS = [
+    "Build a multi-step workflow that processes data from APIs and generates reports",
+    "Create an agent that orchestrates multiple tasks and integrates with various services",
+    "Develop an automated system that chains together multiple AI operations"
+]
+
+
+@pytest.fixture(scope="module")
+def prefetched_classifications(helper):
+    """Classify every bulk description with one batched request; the tests then hit the helper's cache."""
+    helper.use_case_classification_batch(TECHNICAL_DESCRIPTIONS + VISUAL_DESCRIPTIONS + AUTOMATION_DESCRIPTIONS)
 
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("prefetched_classifications")
 class TestUseCaseClassificationOutput:
     """Test that LLM output matches expected format and valid categories."""
 
-    @pytest.fixture
-    def helper(self):
-        """Create a UseCaseHelper instance for testing."""
-        return UseCaseHelper()
-
     def test_classification_returns_valid_category(self, helper):
         """Test that classification returns one of the valid categories."""
         description = "I need a chatbot to answer customer questions about our products"
@@ -57,74 +78,62 @@ class TestUseCaseClassificationOutput:
         result = helper.use_case_classification(description)
 
         # Should not contain special tokens
-        unwanted_tokens = ['<|', '|>', '</', 'EOF', '```', '\n\n']
-        for token in unwanted_tokens:
-            assert token not in result, f"Result should not contain special token '{token}'"
+        unwanted = UNWANTED_TOKEN_RE.search(result)
+        assert unwanted is None, f"Result should not contain special token '{unwanted.group()}'"
 
         # Should be a single category (no extra explanation)
         assert len(result.split()) == 1, \
             f"Result should be a single category, got: '{result}'"
 
-    def test_technical_description_classified_correctly(self, helper):
+    @pytest.mark.parametrize("desc", TECHNICAL_DESCRIPTIONS)
+    def test_technical_description_classified_correctly(self, helper, desc):
         """Test that technical/developer descriptions are classified appropriately."""
-        descriptions = [
-            "I need help debugging Python code and generating unit tests",
-            "Looking for a tool to help with code reviews and refactoring",
-            "Want an AI to help me write SQL queries and optimize database performance"
-        ]
+        result = helper.use_case_classification(desc)
 
-        for desc in descriptions:
-            result = helper.use_case_classification(desc)
+        # Should classify as technical_developer
+        assert result == 'technical_developer', \
+            f"Technical description '{desc}' should be classified as 'technical_developer', got '{result}'"
 
-            # Should classify as technical_developer
-            assert result == 'technical_developer', \
-                f"Technical description '{desc}' should be classified as 'technical_developer', got '{result}'"
-
-    def test_visual_ai_description_classified_correctly(self, helper):
+    @pytest.mark.parametrize("desc", VISUAL_DESCRIPTIONS)
+    def test_visual_ai_description_classified_correctly(self, helper, desc):
         """Test that visual AI descriptions are classified appropriately."""
-        descriptions = [
-            "I want to generate product images for my e-commerce site",
-            "Need to analyze images and extract text from photos",
-            "Looking to edit and enhance photos automatically"
-        ]
-
-        for desc in descriptions:
-            result = helper.use_case_classification(desc)
+        result = helper.use_case_classification(desc)
 
-            # Should classify as visual_ai
-            assert result == 'visual_ai', \
-                f"Visual description '{desc}' should be classified as 'visual_ai', got '{result}'"
+        # Should classify as visual_ai
+        assert result == 'visual_ai', \
+            f"Visual description '{desc}' should be classified as 'visual_ai', got '{result}'"
 
 
+@pytest.mark.integration
+@pytest.mark.usefixtures("prefetched_classifications")
 class TestUseCaseClassificationConsistency:
     """Test that similar inputs produce consistent classifications."""
 
-    @pytest.fixture
-    def helper(self):
-        """Create a UseCaseHelper instance for testing."""
-        return UseCaseHelper()
-
-    def test_similar_descriptions_same_category(self, helper):
+    async def test_similar_descriptions_same_category(self, helper):
         """Test that semantically similar descriptions get the same classification."""
         # Two different ways of describing a chatbot use case
         desc1 = "Build a conversational AI assistant for customer support"
         desc2 = "Create a virtual agent that can answer user questions"
 
-        result1 = helper.use_case_classification(desc1)
-        result2 = helper.use_case_classification(desc2)
+        result1, result2 = await asyncio.gather(
+            helper.ause_case_classification(desc1),
+            helper.ause_case_classification(desc2),
+        )
 
         assert result1 == result2, \
             f"Similar descriptions should get same classification. Got '{result1}' and '{result2}'"
         assert result1 == 'conversational_knowledge', \
             "Both should be classified as conversational_knowledge"
 
-    def test_creative_vs_productivity_distinction(self, helper):
+    async def test_creative_vs_productivity_distinction(self, helper):
         """Test that the classifier can distinguish between creative and productivity tasks."""
         creative_desc = "Write creative fiction stories and poetry"
         productivity_desc = "Summarize long documents and extract key information"
 
-        creative_result = helper.use_case_classification(creative_desc)
-        productivity_result = helper.use_case_classification(productivity_desc)
+        creative_result, productivity_result = await asyncio.gather(
+            helper.ause_case_classification(creative_desc),
+            helper.ause_case_classification(productivity_desc),
+        )
 
         assert creative_result == 'creative_content', \
             f"Creative description should be 'creative_content', got '{creative_result}'"
@@ -133,56 +142,47 @@ class TestUseCaseClassificationConsistency:
         assert creative_result != productivity_result, \
             "Creative and productivity tasks should be classified differently"
 
-    def test_automation_description_classified_correctly(self, helper):
+    @pytest.mark.parametrize("desc", AUTOMATION_DESCRIPTIONS)
+    def test_automation_description_classified_correctly(self, helper, desc):
         """Test that complex automation descriptions are identified."""
-        descriptions = [
-            "Build a multi-step workflow that processes data from APIs and generates reports",
-            "Create an agent that orchestrates multiple tasks and integrates with various services",
-            "Develop an automated system that chains together multiple AI operations"
-        ]
-
-        for desc in descriptions:
-            result = helper.use_case_classification(desc)
+        result = helper.use_case_classification(desc)
 
-            assert result == 'advanced_automation', \
-                f"Automation description should be 'advanced_automation', got '{result}' for: {desc}"
+        assert result == 'advanced_automation', \
+            f"Automation description should be 'advanced_automation', got '{result}' for: {desc}"
 
 
 class TestUseCasePromptBuilding:
     """Test that the prompt is constructed correctly."""
 
-    @pytest.fixture
-    def helper(self):
-        """Create a UseCaseHelper instance for testing."""
-        return UseCaseHelper()
-
-    def test_prompt_includes_user_description(self, helper):
+    def test_prompt_includes_user_description(self, offline_helper):
         """Test that the prompt includes the user's description."""
         user_desc = "I need help with data analysis and visualization"
 
-        prompt = helper._build_prompt(user_desc)
+        prompt = offline_helper._build_prompt(user_desc)
 
         assert user_desc in prompt, "Prompt should include the user's description"
         assert 'Description:' in prompt, "Prompt should have a Description label"
 
-    def test_prompt_includes_all_categories(self, helper):
+    def test_prompt_includes_all_categories(self, offline_helper):
         """Test that the prompt lists all possible categories."""
-        prompt = helper._build_prompt("test description")
+        prompt = offline_helper._build_prompt("test description")
 
         # All categories should be mentioned in the prompt
         for category in VALID_CATEGORIES:
             assert category in prompt, f"Prompt should include category '{category}'"
 
-    def test_prompt_has_clear_instructions(self, helper):
+    def test_prompt_has_clear_instructions(self, offline_helper):
         """Test that the prompt has clear classification instructions."""
-        prompt = helper._build_prompt("test description")
+        prompt = offline_helper._build_prompt("test description")
 
         # Should have instructions to return only the category name
         instruction_keywords = ['return', 'only', 'category', 'one']
-        matches = sum(1 for keyword in instruction_keywords if keyword.lower() in prompt.lower())
+        low = prompt.lower()
+        matches = sum(1 for keyword in instruction_keywords if keyword in low)
 
         assert matches >= 3, "Prompt should have clear instructions to return only the category"
 
+    @pytest.mark.integration
     def test_classification_with_empty_description_handled(self, helper):
         """Test that empty or very short descriptions are handled."""
         result = helper.use_case_classification("")
@@ -191,6 +191,7 @@ class TestUseCasePromptBuilding:
         assert result is None or result in VALID_CATEGORIES, \
             "Empty description should return None or valid category"
 
+    @pytest.mark.integration
     def test_classification_with_ambiguous_description(self, helper):
         """Test that ambiguous descriptions still return a valid category."""
         ambiguous_desc = "I need an AI tool"  # Very vague
@@ -202,14 +203,10 @@ class TestUseCasePromptBuilding:
             f"Ambiguous description should return valid category, got '{result}'"
 
 
+@pytest.mark.integration
 class TestUseCaseEdgeCases:
     """Test edge cases and error handling."""
 
-    @pytest.fixture
-    def helper(self):
-        """Create a UseCaseHelper instance for testing."""
-        return UseCaseHelper()
-
     def test_mixed_use_case_description(self, helper):
         """Test descriptions that could fit multiple categories."""
         # This could be both creative AND productivity
@@ -241,6 +238,152 @@ class TestUseCaseEdgeCases:
             f"Complex customer service system should be conversational or automation, got '{result}'"
 
 
+class FakeEncoder:
+    """Stands in for a SentenceTransformer: categories embed as unit axes, descriptions as given vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, texts, normalize_embeddings=False):
+        if isinstance(texts, list):
+            return np.eye(len(texts))
+        return np.asarray(self.vectors[texts], dtype=float)
+
+
+@pytest.mark.unit
+class TestUseCaseLocalClassification:
+    """Test the keyword and embedding rules that answer without an LLM call."""
+
+    def test_two_keywords_in_one_category_decide(self, offline_helper):
+        """Test that two distinct keywords from exactly one category classify locally."""
+        result = offline_helper._local_classification("Help me debug this Python code")
+
+        assert result == 'technical_developer'
+
+    def test_single_keyword_falls_through(self, offline_helper):
+        """Test that one keyword hit is not enough."""
+        assert offline_helper._local_classification("Write SQL for me") is None
+
+    def test_repeated_keyword_counts_once(self, offline_helper):
+        """Test that the same keyword twice is still a single hit."""
+        assert offline_helper._local_classification("Code, code and more code") is None
+
+    def test_keywords_in_two_categories_fall_through(self, offline_helper):
+        """Test that ambiguous descriptions are left to the LLM."""
+        result = offline_helper._local_classification("Debug code that generates product images")
+
+        assert result is None, f"Ambiguous description should fall through, got '{result}'"
+
+    def test_use_local_off_skips_keywords(self):
+        """Test that use_local=False never answers locally."""
+        helper = UseCaseHelper.offline(use_local=False)
+
+        assert helper._local_classification("Help me debug this Python code") is None
+
+    @pytest.mark.parametrize("scores, expected", [
+        ([0.0, 0.0, 0.0, 0.0, 0.0, 0.9], 'visual_ai'),    # confident and well ahead
+        ([0.0, 0.0, 0.0, 0.0, 0.0, 0.7], None),           # best score too low
+        ([0.0, 0.0, 0.0, 0.0, 0.8, 0.85], None),          # too close to the runner-up
+    ])
+    def test_embedding_thresholds(self, scores, expected):
+        """Test that the embedding model only answers when similar enough and clearly ahead."""
+        helper = UseCaseHelper.offline()
+        helper.set_embedding_model(FakeEncoder({"Something new": scores}))
+
+        assert helper._local_classification("Something new") == expected
+
+    def test_use_local_off_answers_from_llm(self, openrouter_mock):
+        """Test that use_local=False sends even clear-cut descriptions to the LLM."""
+        openrouter_mock.reply("creative_content")
+
+        result = UseCaseHelper(use_local=False).use_case_classification("Help me debug this Python code")
+
+        assert result == 'creative_content', "The LLM reply should be used, not the keyword rule"
+        assert openrouter_mock.route.call_count == 1
+
+
+@pytest.mark.unit
+class TestUseCaseClassificationMocked:
+    """Test the classification request and reply handling against canned API responses."""
+
+    def test_reply_is_returned_as_category(self, openrouter_mock):
+        """Test that a clean category reply is returned and the request is deterministic."""
+        openrouter_mock.reply("technical_developer")
+
+        result = UseCaseHelper().use_case_classification("Help me refactor a Django app")
+
+        assert result == 'technical_developer'
+        body = json.loads(openrouter_mock.route.calls.last.request.content)
+        assert body['temperature'] == 0, "Classification should be requested at temperature 0"
+        assert body['max_tokens'] <= 16, "Classification should only allow a short reply"
+
+    def test_noisy_reply_is_cleaned(self, openrouter_mock):
+        """Test that special tokens and casing are stripped from the reply."""
+        openrouter_mock.reply(" Visual_AI<|im_end|>\n")
+
+        result = UseCaseHelper().use_case_classification("Generate product photos")
+
+        assert result == 'visual_ai', f"Noisy reply should map to 'visual_ai', got '{result}'"
+
+    def test_unrecognised_reply_is_not_cached(self, openrouter_mock):
+        """Test that a reply matching no category returns None and is asked again next time."""
+        openrouter_mock.reply("banana")
+        helper = UseCaseHelper()
+
+        assert helper.use_case_classification("Something odd") is None
+        assert helper.use_case_classification("Something odd") is None
+        assert openrouter_mock.route.call_count == 2, "Unrecognised replies should not be cached"
+
+
+
+@pytest.mark.unit
+class TestUseCaseBatchClassificationMocked:
+    """Test the batched request's answer parsing and fallbacks against canned API responses."""
+
+    def test_lines_map_back_by_number(self, openrouter_mock):
+        """Test that out-of-order answers in "1.", "2)" and "3:" forms land on the right descriptions."""
+        openrouter_mock.reply("3: visual_ai\n1. creative_content\n2) technical_developer")
+
+        results = UseCaseHelper(use_local=False).use_case_classification_batch(["First", "Second", "Third"])
+
+        assert results == ['creative_content', 'technical_developer', 'visual_ai']
+        assert openrouter_mock.route.call_count == 1, "All answers should come from one request"
+
+    def test_out_of_range_number_is_ignored(self, openrouter_mock):
+        """Test that an answer numbered past the last description is dropped."""
+        openrouter_mock.reply("1. creative_content\n4. visual_ai\n2. technical_developer")
+
+        results = UseCaseHelper(use_local=False).use_case_classification_batch(["First", "Second"])
+
+        assert results == ['creative_content', 'technical_developer']
+        assert openrouter_mock.route.call_count == 1
+
+    def test_missing_line_falls_back_to_single_call(self, openrouter_mock):
+        """Test that a description the batch answer skips is classified on its own."""
+        openrouter_mock.reply("1. creative_content", "visual_ai")
+
+        results = UseCaseHelper(use_local=False).use_case_classification_batch(["First", "Second"])
+
+        assert results == ['creative_content', 'visual_ai']
+        assert openrouter_mock.route.call_count == 2
+        fallback = openrouter_mock.route.calls.last.request.content.decode()
+        assert 'Second' in fallback and 'First' not in fallback, \
+            "The fallback request should only carry the unanswered description"
+
+    def test_cached_descriptions_are_not_resent(self, openrouter_mock):
+        """Test that descriptions already classified are left out of the batch and renumbered."""
+        helper = UseCaseHelper(use_local=False)
+        openrouter_mock.reply("creative_content")
+        helper.use_case_classification("First")
+
+        openrouter_mock.reply("1. visual_ai")
+        results = helper.use_case_classification_batch(["First", "Second"])
+
+        assert results == ['creative_content', 'visual_ai']
+        batch = openrouter_mock.route.calls.last.request.content.decode()
+        assert 'Second' in batch and 'First' not in batch, "Cached descriptions should not be resent"
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, '-v'])